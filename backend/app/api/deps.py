@@ -1,12 +1,13 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import get_db
+from app.db.session import get_db, SessionLocal
 from app.db.user_repository import UserRepository
 from app.services.user_service import UserService
 from app.core.security import decode_token
 from app.models.user import User, UserRole
-from typing import List
+from app.schemas.user import UserResponse
+from typing import List, Optional
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
@@ -36,6 +37,17 @@ async def get_current_user(
         raise HTTPException(status_code=400, detail="Inactive user")
     return user
 
+async def is_admin_token(token: str) -> bool:
+    """
+    Token check for code running outside the dependency system (middleware).
+    """
+    payload = decode_token(token)
+    if not payload or payload.get("type") != "access":
+        return False
+    async with SessionLocal() as db:
+        user = await UserRepository(db).get(payload.get("sub"))
+    return bool(user and user.is_active and user.role == UserRole.ADMIN)
+
 class RoleChecker:
     def __init__(self, allowed_roles: List[UserRole]):
         self.allowed_roles = allowed_roles
@@ -47,3 +59,17 @@ class RoleChecker:
                 detail="You do not have enough permissions"
             )
         return user
+
+def get_response_fields(
+    fields: Optional[str] = Query(None, description="Comma-separated UserResponse fields to return, e.g. id,email")
+) -> Optional[List[str]]:
+    if not fields:
+        return None
+    requested = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in UserResponse.model_fields]
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid fields: {', '.join(unknown) or fields}"
+        )
+    return requested
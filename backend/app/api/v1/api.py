@@ -5,3 +5,5 @@ api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 from app.api.v1.endpoints import users
 api_router.include_router(users.router, prefix="/users", tags=["users"])
+from app.api.v1.endpoints import diagnostics
+api_router.include_router(diagnostics.router, prefix="/diagnostics", tags=["diagnostics"])
@@ -1,7 +1,10 @@
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from app.schemas.user import UserCreate, UserLogin, Token, UserResponse
 from app.services.user_service import UserService
-from app.api.deps import get_user_service, get_current_user
+from app.api.deps import get_user_service, get_current_user, get_response_fields
 from app.models.user import User
 
 router = APIRouter()
@@ -16,5 +19,11 @@ async def login(login_data: UserLogin, service: UserService = Depends(get_user_s
     return {"access_token": access_token, "refresh_token": refresh_token}
 
 @router.get("/me", response_model=UserResponse)
-async def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(
+    fields: Optional[List[str]] = Depends(get_response_fields),
+    current_user: User = Depends(get_current_user)
+):
+    # The full row is already loaded to authenticate, so only the payload shrinks here
+    if fields:
+        return JSONResponse(jsonable_encoder({field: getattr(current_user, field) for field in fields}))
     return current_user
@@ -0,0 +1,37 @@
+from typing import Dict, List
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from app.api.deps import RoleChecker
+from app.core.diagnostics import loop_lag_monitor, profile_store
+from app.models.user import UserRole
+
+check_admin = RoleChecker([UserRole.ADMIN])
+
+router = APIRouter(dependencies=[Depends(check_admin)])
+
+@router.get("/loop-lag")
+async def read_loop_lag() -> Dict:
+    """
+    Event loop lag percentiles over the recent sample window.
+    """
+    return {"enabled": loop_lag_monitor.running, **loop_lag_monitor.stats()}
+
+@router.get("/profiles")
+async def read_profiles() -> List[Dict[str, str]]:
+    """
+    Stored request profiles, newest first.
+    """
+    return profile_store.list()
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def read_profile(profile_id: str):
+    """
+    A request profile as collapsed stacks, ready for flamegraph.pl or speedscope.
+    """
+    profile = profile_store.get(profile_id)
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return profile["collapsed"]
@@ -1,9 +1,17 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from app.schemas.user import UserResponse, UserUpdate, UserCreate
+from typing import List, Optional
+import json
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.user import UserResponse, UserUpdate, UserCreate, UserBatchRequest, UserBatchResponse
 from app.services.user_service import UserService
-from app.api.deps import get_user_service, get_current_user, RoleChecker
+from app.api.deps import get_user_service, get_current_user, get_response_fields, RoleChecker
 from app.models.user import User, UserRole
+from app.core.config import settings
+from app.db.session import get_db
+from app.services.user_events import user_events
+from app.services.user_search import user_search_index
 
 router = APIRouter()
 
@@ -14,11 +22,14 @@ check_admin = RoleChecker([UserRole.ADMIN])
 async def read_users(
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[List[str]] = Depends(get_response_fields),
     service: UserService = Depends(get_user_service)
 ):
     """
     Retrieve users. Only for Admins.
     """
+    if fields:
+        return JSONResponse(jsonable_encoder(await service.get_users_fields(fields, skip=skip, limit=limit)))
     return await service.get_users(skip=skip, limit=limit)
 
 @router.post("/", response_model=UserResponse, dependencies=[Depends(check_admin)])
@@ -31,9 +42,112 @@ async def create_user(
     """
     return await service.register_user(user_in)
 
+@router.get("/search", response_model=List[UserResponse], dependencies=[Depends(check_admin)])
+async def search_users(
+    q: str = Query(..., min_length=1, max_length=255),
+    limit: int = Query(20, ge=1, le=100),
+    service: UserService = Depends(get_user_service)
+):
+    """
+    Search users by partial email, username or full name. Only for Admins.
+    """
+    return await service.search_users(q, limit=limit)
+
+@router.post("/search/rebuild", status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(check_admin)])
+async def rebuild_search_index():
+    """
+    Rebuild the in-memory search index, e.g. after a bulk import. Only for Admins.
+    """
+    if not user_search_index.rebuild():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Search index is disabled"
+        )
+    return {"status": "rebuilding"}
+
+@router.get("/events", dependencies=[Depends(check_admin)])
+async def stream_user_events(
+    request: Request,
+    last_event_id: Optional[int] = Header(None),
+    since: Optional[int] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Server-Sent Events feed of user changes. Only for Admins.
+
+    Resume with the standard `Last-Event-ID` header or `?since=<seq>`.
+    Every stream opens with a `hello` event carrying the current sequence.
+    A `resync` event means the client missed changes and should reload the list.
+    """
+    # Hand the connection back to the pool; the stream itself never touches the DB
+    await db.close()
+    resume_from = last_event_id if last_event_id is not None else since
+
+    async def event_stream():
+        # Subscribe inside the generator so the finally clause always pairs with it
+        subscription = user_events.subscribe(resume_from)
+        # The position this stream starts from; clients resume from it even
+        # if the connection drops before any change arrives
+        hello = {"seq": user_events.last_seq if resume_from is None else resume_from, "type": "hello", "user": None}
+        try:
+            yield "retry: 3000\n\n"
+            yield f"id: {hello['seq']}\nevent: hello\ndata: {json.dumps(hello)}\n\n"
+            while True:
+                event = await subscription.get(timeout=settings.USER_EVENTS_KEEPALIVE_SECONDS)
+                if await request.is_disconnected():
+                    break
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            user_events.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.post("/batch", response_model=UserBatchResponse)
+async def read_users_batch(
+    batch_in: UserBatchRequest,
+    current_user: User = Depends(get_current_user),
+    service: UserService = Depends(get_user_service)
+):
+    """
+    Get many users by id or email in one query. Every requested key appears
+    in the result; permissions are the same as for reading a single user.
+    """
+    requested = batch_in.ids if batch_in.ids is not None else batch_in.emails
+    if batch_in.ids is not None:
+        key = "id"
+        lookup = {user_id: user_id for user_id in requested}
+        own_key = current_user.id
+    else:
+        key = "email"
+        lookup = {email: email.strip().lower() for email in requested}
+        own_key = current_user.email.lower()
+
+    is_admin = current_user.role == UserRole.ADMIN
+    allowed = {value: normalized for value, normalized in lookup.items() if is_admin or normalized == own_key}
+    found = await service.get_users_by_keys(list(dict.fromkeys(allowed.values())), key=key)
+
+    users, missing, forbidden = {}, [], []
+    for value, normalized in lookup.items():
+        if value not in allowed:
+            forbidden.append(str(value))
+            continue
+        user = found.get(normalized)
+        users[str(value)] = user
+        if user is None:
+            missing.append(str(value))
+    return {"users": users, "missing": missing, "forbidden": forbidden}
+
 @router.get("/{user_id}", response_model=UserResponse)
 async def read_user(
     user_id: int,
+    fields: Optional[List[str]] = Depends(get_response_fields),
     current_user: User = Depends(get_current_user),
     service: UserService = Depends(get_user_service)
 ):
@@ -45,6 +159,8 @@ async def read_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
+    if fields:
+        return JSONResponse(jsonable_encoder(await service.get_user_fields(user_id, fields)))
     return await service.get_user_by_id(user_id)
 
 @router.put("/{user_id}", response_model=UserResponse)
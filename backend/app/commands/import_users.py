@@ -0,0 +1,332 @@
+"""
+Bulk import users from a CSV or NDJSON file.
+
+    python -m app.commands.import_users users.ndjson --batch-size 5000
+
+Each record needs an `email` and either a plaintext `password` or an Argon2
+`hashed_password`; `full_name`, `username`, `role` and `is_active` are
+optional. Users are matched on email only: new emails are inserted, existing
+ones updated. Blank or missing optional values keep the stored value (new
+users get the usual defaults). Records that cannot be applied, including a
+username owned by a different user, are written with their line number and
+reason to a rejects file.
+
+Progress is checkpointed after every committed batch, so re-running the
+same command after a crash resumes where it stopped.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import bindparam, func, insert, select, update
+from app.core.security import get_password_hash, pwd_context
+from app.db.session import engine
+from app.models.user import User, UserRole
+
+HASH_CHUNK_SIZE = 64
+TRUE_VALUES = ("1", "true", "yes", "y", "t")
+FALSE_VALUES = ("0", "false", "no", "n", "f")
+
+Record = Tuple[int, Any]
+Reject = Tuple[int, Optional[str], str]
+
+
+def read_records(path: str, fmt: str) -> Iterator[Record]:
+    """
+    Yield (line number, record) pairs. Unparseable NDJSON lines are yielded
+    as None so they are rejected instead of aborting the run.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, record
+        else:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_no, json.loads(line)
+                except ValueError:
+                    yield line_no, None
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    return [get_password_hash(password) for password in passwords]
+
+
+def blank_to_none(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def normalize(record: Any) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Validate a raw record. Returns (row, None) or (None, reason).
+    Optional fields that are blank or missing stay None ("not provided").
+    """
+    if not isinstance(record, dict):
+        return None, "not a valid record"
+    email = (blank_to_none(record.get("email")) or "").lower()
+    if not email:
+        return None, "missing email"
+
+    hashed_password = blank_to_none(record.get("hashed_password"))
+    password = record.get("password") or None
+    if hashed_password and pwd_context.identify(hashed_password) != "argon2":
+        return None, "unsupported password hash (expected argon2)"
+    if not hashed_password and not password:
+        return None, "missing password"
+
+    role = blank_to_none(record.get("role"))
+    if role is not None:
+        role = role.lower()
+        if role not in (r.value for r in UserRole):
+            return None, f"invalid role {role!r}"
+        role = UserRole(role)
+
+    is_active = record.get("is_active")
+    if not isinstance(is_active, bool):
+        is_active = blank_to_none(is_active)
+        if is_active is not None:
+            if is_active.lower() in TRUE_VALUES:
+                is_active = True
+            elif is_active.lower() in FALSE_VALUES:
+                is_active = False
+            else:
+                return None, f"invalid is_active {is_active!r}"
+
+    return {
+        "email": email,
+        "username": blank_to_none(record.get("username")),
+        "full_name": blank_to_none(record.get("full_name")),
+        "is_active": is_active,
+        "role": role,
+        "hashed_password": hashed_password,
+        "password": None if hashed_password else str(password),
+    }, None
+
+
+def merge(base: Optional[Dict[str, Any]], row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fold a later record for the same email into an earlier one.
+    """
+    if base is None:
+        return row
+    merged = dict(base)
+    merged.update({key: value for key, value in row.items() if value is not None})
+    return merged
+
+
+class RejectLog:
+    def __init__(self, path: str, resume: bool):
+        self.path = path
+        self.count = 0
+        # A fresh run starts a fresh file; a resumed one keeps earlier rejects
+        if not resume and os.path.exists(path):
+            os.remove(path)
+
+    def write(self, rejects: List[Reject]) -> None:
+        if not rejects:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            for line_no, email, reason in rejects:
+                f.write(json.dumps({"line": line_no, "email": email, "reason": reason}) + "\n")
+        self.count += len(rejects)
+
+
+class Checkpoint:
+    def __init__(self, path: str, source: str):
+        self.path = path
+        self.source = os.path.abspath(source)
+
+    def load(self) -> int:
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path) as f:
+            data = json.load(f)
+        if data.get("source") != self.source:
+            raise SystemExit(f"Checkpoint {self.path} belongs to {data.get('source')}, not {self.source}")
+        return data["records"]
+
+    def save(self, records: int) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"source": self.source, "records": records}, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class UserImporter:
+    def __init__(self, pool: ProcessPoolExecutor):
+        self.pool = pool
+        self.table = table = User.__table__
+        self.insert = insert(table)
+        # Blank (None) values keep what is stored
+        self.update = (
+            update(table)
+            .where(table.c.email == bindparam("b_email"))
+            .values(
+                username=func.coalesce(bindparam("b_username", type_=table.c.username.type), table.c.username),
+                full_name=func.coalesce(bindparam("b_full_name", type_=table.c.full_name.type), table.c.full_name),
+                is_active=func.coalesce(bindparam("b_is_active", type_=table.c.is_active.type), table.c.is_active),
+                role=func.coalesce(bindparam("b_role", type_=table.c.role.type), table.c.role),
+                hashed_password=bindparam("b_hashed_password", type_=table.c.hashed_password.type),
+            )
+        )
+
+    async def prepare(self, records: List[Record]) -> Tuple[List[Dict[str, Any]], List[Reject]]:
+        """
+        Validate records and hash plaintext passwords across the process
+        pool, in chunks to keep pickling overhead low.
+        """
+        rows, rejects = [], []
+        for line_no, record in records:
+            row, reason = normalize(record)
+            if row is None:
+                email = record.get("email") if isinstance(record, dict) else None
+                rejects.append((line_no, email, reason))
+            else:
+                row["line"] = line_no
+                rows.append(row)
+
+        pending = [row for row in rows if row["password"] is not None]
+        loop = asyncio.get_running_loop()
+        chunks = [pending[i:i + HASH_CHUNK_SIZE] for i in range(0, len(pending), HASH_CHUNK_SIZE)]
+        hashed = await asyncio.gather(*(
+            loop.run_in_executor(self.pool, hash_passwords, [row["password"] for row in chunk])
+            for chunk in chunks
+        ))
+        for chunk, hashes in zip(chunks, hashed):
+            for row, hashed_password in zip(chunk, hashes):
+                row["hashed_password"] = hashed_password
+        for row in rows:
+            del row["password"]
+        return rows, rejects
+
+    async def write(self, rows: List[Dict[str, Any]]) -> Tuple[int, List[Reject]]:
+        """
+        Insert new emails and update existing ones in one transaction.
+        A username held by a different email rejects the record rather than
+        touching the other user's row.
+        """
+        rejects: List[Reject] = []
+        if not rows:
+            return 0, rejects
+        table = self.table
+        async with engine.begin() as conn:
+            result = await conn.execute(
+                select(table.c.email).where(table.c.email.in_({row["email"] for row in rows}))
+            )
+            existing = {email.lower() for email in result.scalars()}
+
+            for row in rows:
+                if row["username"] is None and row["email"] not in existing:
+                    row["username"] = row["email"]
+            wanted = {row["username"] for row in rows if row["username"]}
+            owners: Dict[str, str] = {}
+            if wanted:
+                result = await conn.execute(
+                    select(table.c.username, table.c.email).where(table.c.username.in_(wanted))
+                )
+                owners = {username.lower(): email.lower() for username, email in result.all()}
+
+            inserts: Dict[str, Dict[str, Any]] = {}
+            updates: Dict[str, Dict[str, Any]] = {}
+            for row in rows:
+                line_no, email = row.pop("line"), row["email"]
+                if row["username"]:
+                    owner = owners.setdefault(row["username"].lower(), email)
+                    if owner != email:
+                        rejects.append((line_no, email, f"username {row['username']!r} belongs to another user"))
+                        continue
+                target = updates if email in existing else inserts
+                target[email] = merge(target.get(email), row)
+
+            if inserts:
+                await conn.execute(self.insert, [
+                    {
+                        **row,
+                        "is_active": True if row["is_active"] is None else row["is_active"],
+                        "role": row["role"] or UserRole.USER,
+                    }
+                    for row in inserts.values()
+                ])
+            if updates:
+                await conn.execute(self.update, [
+                    {f"b_{key}": value for key, value in row.items()} for row in updates.values()
+                ])
+        return len(rows) - len(rejects), rejects
+
+
+async def run(args: argparse.Namespace) -> None:
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    checkpoint = Checkpoint(args.checkpoint or f"{args.path}.checkpoint", args.path)
+    done = resumed_from = checkpoint.load()
+    if done:
+        print(f"Resuming after {done} records")
+    reject_log = RejectLog(args.rejects or f"{args.path}.rejects", resume=bool(done))
+
+    records = read_records(args.path, fmt)
+    for _ in islice(records, done):
+        pass
+
+    started = time.monotonic()
+    imported = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        importer = UserImporter(pool)
+        # Hash batch N+1 while batch N is being written
+        in_flight = None
+        while True:
+            batch = list(islice(records, args.batch_size))
+            next_batch = (len(batch), asyncio.ensure_future(importer.prepare(batch))) if batch else None
+            if in_flight:
+                size, prepared = in_flight
+                rows, rejects = await prepared
+                written, conflicts = await importer.write(rows)
+                reject_log.write(rejects + conflicts)
+                done += size
+                imported += written
+                checkpoint.save(done)
+                rate = (done - resumed_from) / (time.monotonic() - started)
+                print(f"{done} records processed ({imported} imported, {reject_log.count} rejected), {rate:.0f} records/s")
+            if not next_batch:
+                break
+            in_flight = next_batch
+
+    checkpoint.clear()
+    await engine.dispose()
+    print(f"SUCCESS: Imported {imported} users in {time.monotonic() - started:.1f}s")
+    if reject_log.count:
+        print(f"{reject_log.count} records rejected in this run, see {reject_log.path}")
+    print("If the user search index is enabled, rebuild it: POST /api/v1/users/search/rebuild")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk import users from CSV or NDJSON.")
+    parser.add_argument("path", help="CSV or NDJSON file to import")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="Input format (default: from file extension)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Records per insert batch")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Password hashing processes")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <path>.checkpoint)")
+    parser.add_argument("--rejects", help="File for rejected records (default: <path>.rejects)")
+    args = parser.parse_args()
+
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
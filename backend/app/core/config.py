@@ -19,6 +19,21 @@ class Settings(BaseSettings):
     MYSQL_SERVER: str = "localhost"
     MYSQL_PORT: str = "3306"
     MYSQL_DB: str = "management_db"
+    DB_IN_CHUNK_SIZE: int = 1000
+
+    # Batch lookups
+    USERS_BATCH_MAX_ITEMS: int = 500
+
+    # Live user change feed
+    USER_EVENTS_QUEUE_SIZE: int = 100
+    USER_EVENTS_HISTORY: int = 1000
+    USER_EVENTS_KEEPALIVE_SECONDS: int = 15
+
+    # In-memory user search index
+    USER_SEARCH_INDEX_ENABLED: bool = False
+    USER_SEARCH_BUILD_BATCH: int = 10000
+    USER_SEARCH_REFRESH_SECONDS: int = 0
+    USER_SEARCH_MAX_SCAN: int = 2000
     
     @property
     def DATABASE_URL(self) -> str:
@@ -26,6 +41,15 @@ class Settings(BaseSettings):
 
     # Logging
     LOG_LEVEL: str = "INFO"
+
+    # Diagnostics
+    LOOP_LAG_MONITOR_ENABLED: bool = False
+    LOOP_LAG_INTERVAL_MS: int = 100
+    LOOP_LAG_THRESHOLD_MS: int = 200
+    LOOP_LAG_WINDOW: int = 1024
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_INTERVAL_MS: float = 1.0
+    PROFILING_MAX_STORED: int = 20
     
     model_config = SettingsConfigDict(env_file=None, case_sensitive=True, extra="ignore")
 
@@ -0,0 +1,227 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+import uuid
+from collections import Counter, OrderedDict, deque
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import parse_qs
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def collapse_stack(frame) -> str:
+    """
+    Render a frame chain root-first as a `;`-joined line, the format
+    consumed by flamegraph.pl / speedscope.
+    """
+    parts: List[str] = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+class LoopLagMonitor:
+    """
+    Measures how late the event loop wakes up from a fixed sleep.
+
+    A coroutine records the lag of every tick, while a watchdog thread
+    notices when ticks stop arriving altogether and logs the stack the loop
+    thread is stuck in -- the coroutine itself cannot do that, since it only
+    runs once the blocking call has already returned.
+    """
+
+    def __init__(self, interval_ms: int, threshold_ms: int, window: int):
+        self.interval = interval_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self.samples: deque = deque(maxlen=window)
+        self._heartbeat = 0.0
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _sample(self) -> None:
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            lag = now - started - self.interval
+            self.samples.append(lag)
+            if lag > self.threshold:
+                logger.warning(f"Event loop lag {lag * 1000:.1f}ms exceeded threshold")
+
+    def _watch(self) -> None:
+        reported_for = None
+        while not self._stop.wait(self.interval):
+            heartbeat = self._heartbeat
+            if heartbeat == reported_for:
+                continue
+            if time.monotonic() - heartbeat > self.interval + self.threshold:
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is not None:
+                    stack = "".join(traceback.format_stack(frame))
+                    logger.warning(f"Event loop blocked, loop thread stack:\n{stack}")
+                reported_for = heartbeat
+
+    def stats(self) -> Dict[str, float]:
+        samples = sorted(self.samples)
+        if not samples:
+            return {"count": 0}
+
+        def percentile(p: float) -> float:
+            index = min(len(samples) - 1, int(round(p / 100 * (len(samples) - 1))))
+            return round(samples[index] * 1000, 3)
+
+        return {
+            "count": len(samples),
+            "p50_ms": percentile(50),
+            "p90_ms": percentile(90),
+            "p99_ms": percentile(99),
+            "max_ms": round(samples[-1] * 1000, 3),
+        }
+
+
+class SamplingProfiler:
+    """
+    Samples the stack of one thread from a background thread and counts
+    collapsed stacks. Other tasks sharing the event loop show up in the
+    samples too, so profile on a quiet instance when possible.
+    """
+
+    def __init__(self, interval_ms: float):
+        self.interval = interval_ms / 1000
+        self.stacks: Counter = Counter()
+        self._target: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "SamplingProfiler":
+        self._target = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is not None:
+                self.stacks[collapse_stack(frame)] += 1
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    def __init__(self, max_items: int):
+        self.max_items = max_items
+        self._items: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+
+    def add(self, profile_id: str, path: str, collapsed: str) -> None:
+        self._items[profile_id] = {"id": profile_id, "path": path, "collapsed": collapsed}
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[Dict[str, str]]:
+        return self._items.get(profile_id)
+
+    def list(self) -> List[Dict[str, str]]:
+        return [{"id": item["id"], "path": item["path"]} for item in reversed(self._items.values())]
+
+
+class ProfilingMiddleware:
+    """
+    Runs a request under the sampling profiler when it carries an
+    `X-Profile: 1` header or `profile=1` query flag and `authorize` accepts
+    its bearer token. The profile id is returned in `X-Profile-Id`.
+    Requests without the flag pass straight through.
+    """
+
+    def __init__(self, app, authorize: Callable[[str], Awaitable[bool]]):
+        self.app = app
+        self.authorize = authorize
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        token = self._bearer_token(scope)
+        if not token or not await self.authorize(token):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        profiler = SamplingProfiler(settings.PROFILING_SAMPLE_INTERVAL_MS)
+        try:
+            with profiler:
+                await self.app(scope, receive, send_with_id)
+        finally:
+            profile_store.add(profile_id, scope["path"], profiler.collapsed())
+
+    @staticmethod
+    def _requested(scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                return value == b"1"
+        query = scope.get("query_string", b"")
+        if b"profile=" not in query:
+            return False
+        return parse_qs(query.decode()).get("profile") == ["1"]
+
+    @staticmethod
+    def _bearer_token(scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.decode().partition(" ")
+                if scheme.lower() == "bearer" and token:
+                    return token
+        return None
+
+
+loop_lag_monitor = LoopLagMonitor(
+    interval_ms=settings.LOOP_LAG_INTERVAL_MS,
+    threshold_ms=settings.LOOP_LAG_THRESHOLD_MS,
+    window=settings.LOOP_LAG_WINDOW,
+)
+profile_store = ProfileStore(max_items=settings.PROFILING_MAX_STORED)
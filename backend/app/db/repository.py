@@ -1,7 +1,8 @@
-from typing import Generic, TypeVar, Type, Optional, List, Any, Dict
+from typing import Generic, TypeVar, Type, Optional, List, Any, Dict, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, delete
 from sqlalchemy.orm import DeclarativeBase
+from app.core.config import settings
 
 class Base(DeclarativeBase):
     pass
@@ -18,11 +19,39 @@ class BaseRepository(Generic[ModelType]):
         result = await self.db.execute(query)
         return result.scalars().first()
 
+    async def get_many(self, values: Sequence[Any], key: str = "id") -> List[ModelType]:
+        """
+        Fetch all rows whose `key` column is in `values`, one IN query per
+        DB_IN_CHUNK_SIZE values. Missing values are simply absent from the result.
+        """
+        column = getattr(self.model, key)
+        chunk_size = settings.DB_IN_CHUNK_SIZE
+        items: List[ModelType] = []
+        for i in range(0, len(values), chunk_size):
+            query = select(self.model).where(column.in_(values[i:i + chunk_size]))
+            result = await self.db.execute(query)
+            items.extend(result.scalars().all())
+        return items
+
     async def get_multi(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
-        query = select(self.model).offset(skip).limit(limit)
+        query = select(self.model).order_by(self.model.id).offset(skip).limit(limit)
         result = await self.db.execute(query)
         return result.scalars().all()
 
+    async def get_fields(self, id: Any, fields: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """
+        Like `get`, but selects only the given columns and returns a plain dict.
+        """
+        query = select(*(getattr(self.model, field) for field in fields)).where(self.model.id == id)
+        result = await self.db.execute(query)
+        row = result.mappings().first()
+        return dict(row) if row else None
+
+    async def get_multi_fields(self, fields: Sequence[str], skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        query = select(*(getattr(self.model, field) for field in fields)).order_by(self.model.id).offset(skip).limit(limit)
+        result = await self.db.execute(query)
+        return [dict(row) for row in result.mappings().all()]
+
     async def create(self, obj_in_data: Dict[str, Any]) -> ModelType:
         db_obj = self.model(**obj_in_data)
         self.db.add(db_obj)
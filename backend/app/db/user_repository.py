@@ -1,6 +1,6 @@
-from typing import Optional, Any
+from typing import Optional, Any, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, or_
 from app.db.repository import BaseRepository
 from app.models.user import User
 
@@ -17,3 +17,13 @@ class UserRepository(BaseRepository[User]):
         query = select(self.model).where(self.model.username == username)
         result = await self.db.execute(query)
         return result.scalars().first()
+
+    async def search(self, term: str, limit: int = 20, prefix_only: bool = False) -> List[User]:
+        columns = (self.model.email, self.model.username, self.model.full_name)
+        if prefix_only:
+            conditions = [column.startswith(term, autoescape=True) for column in columns]
+        else:
+            conditions = [column.contains(term, autoescape=True) for column in columns]
+        query = select(self.model).where(or_(*conditions)).order_by(self.model.email).limit(limit)
+        result = await self.db.execute(query)
+        return result.scalars().all()
@@ -1,20 +1,38 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.api import api_router
 from app.core.config import settings
 from app.core.logging import setup_logging
+from app.core.diagnostics import loop_lag_monitor, ProfilingMiddleware
+from app.api.deps import is_admin_token
+from app.services.user_search import user_search_index
 import logging
 
 # Initialize logging
 setup_logging()
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.LOOP_LAG_MONITOR_ENABLED:
+        loop_lag_monitor.start()
+    user_search_index.start()
+    yield
+    await user_search_index.stop()
+    await loop_lag_monitor.stop()
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
+# Per-request profiling (only installed when enabled, so it costs nothing otherwise)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, authorize=is_admin_token)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field, model_validator
+from typing import Optional, List, Dict
 from app.models.user import UserRole
+from app.core.config import settings
 
 class UserBase(BaseModel):
     email: EmailStr
@@ -33,3 +34,19 @@ class UserResponse(UserBase):
 
     class Config:
         from_attributes = True
+
+class UserBatchRequest(BaseModel):
+    ids: Optional[List[int]] = Field(None, max_length=settings.USERS_BATCH_MAX_ITEMS)
+    # Plain strings so results are keyed by exactly what was sent
+    emails: Optional[List[str]] = Field(None, max_length=settings.USERS_BATCH_MAX_ITEMS)
+
+    @model_validator(mode="after")
+    def check_one_key(self):
+        if (self.ids is None) == (self.emails is None):
+            raise ValueError("Provide exactly one of 'ids' or 'emails'")
+        return self
+
+class UserBatchResponse(BaseModel):
+    users: Dict[str, Optional[UserResponse]]
+    missing: List[str]
+    forbidden: List[str]
@@ -0,0 +1,85 @@
+import asyncio
+import itertools
+from collections import deque
+from typing import Any, Dict, Optional, Set
+from app.core.config import settings
+from app.models.user import User
+from app.schemas.user import UserResponse
+
+RESYNC = "resync"
+
+
+class UserEventSubscription:
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def push(self, event: Dict[str, Any]) -> None:
+        """
+        Enqueue without blocking the publisher. A subscriber that falls
+        behind loses its backlog and gets a single resync event instead,
+        telling it to reload the user list.
+        """
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"seq": event["seq"], "type": RESYNC, "user": None})
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class UserEventBroker:
+    """
+    In-process fan-out of user changes to live subscribers.
+
+    Events carry an increasing sequence number and the most recent ones are
+    kept so a reconnecting client can resume from its last seen sequence.
+    State lives in this process only, so with several workers each one
+    serves the changes it made itself.
+    """
+
+    def __init__(self, queue_size: int, history_size: int):
+        self.queue_size = queue_size
+        self.history: deque = deque(maxlen=history_size)
+        self.subscribers: Set[UserEventSubscription] = set()
+        self._seq = itertools.count(1)
+        self.last_seq = 0
+
+    def publish(self, event_type: str, user: User) -> None:
+        self.last_seq = next(self._seq)
+        event = {
+            "seq": self.last_seq,
+            "type": event_type,
+            "user": UserResponse.model_validate(user).model_dump(mode="json"),
+        }
+        self.history.append(event)
+        for subscription in self.subscribers:
+            subscription.push(event)
+
+    def subscribe(self, last_seq: Optional[int] = None) -> UserEventSubscription:
+        subscription = UserEventSubscription(self.queue_size)
+        if last_seq is not None and last_seq != self.last_seq:
+            oldest = self.history[0]["seq"] if self.history else self.last_seq + 1
+            if last_seq > self.last_seq or last_seq < oldest - 1:
+                # Unknown or expired position (e.g. server restart): start over
+                subscription.push({"seq": self.last_seq, "type": RESYNC, "user": None})
+            else:
+                for event in self.history:
+                    if event["seq"] > last_seq:
+                        subscription.push(event)
+        self.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: UserEventSubscription) -> None:
+        self.subscribers.discard(subscription)
+
+
+user_events = UserEventBroker(
+    queue_size=settings.USER_EVENTS_QUEUE_SIZE,
+    history_size=settings.USER_EVENTS_HISTORY,
+)
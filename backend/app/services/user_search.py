@@ -0,0 +1,288 @@
+import asyncio
+import logging
+from array import array
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from sqlalchemy import select
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Shorter terms match field prefixes only, both here and in the SQL fallback
+MIN_SUBSTRING_LENGTH = 3
+
+# (email, username, full_name, role, is_active)
+Doc = Tuple[str, Optional[str], Optional[str], Any, bool]
+
+
+def _keys(doc: Doc) -> Set[str]:
+    return {field.lower() for field in doc[:3] if field}
+
+
+def _trigrams(keys: Set[str]) -> Set[str]:
+    return {key[i:i + 3] for key in keys for i in range(len(key) - 2)}
+
+
+class IndexData:
+    """
+    The searchable structures, built as a unit so a rebuild can be prepared
+    off the event loop and swapped in at once.
+
+    `keys` is a sorted list of lower-cased field values with the owning ids
+    in the parallel `key_ids` array, for prefix lookups by bisection.
+    `postings` maps each trigram to a sorted `array('I')` of user ids.
+    """
+
+    def __init__(self):
+        self.docs: Dict[int, Doc] = {}
+        self.keys: List[str] = []
+        self.key_ids = array("I")
+        self.postings: Dict[str, array] = {}
+
+    @classmethod
+    def build(cls, rows: Sequence[Tuple]) -> "IndexData":
+        """
+        Build from (id, *doc) rows ordered by id, so postings fill by append.
+        """
+        data = cls()
+        postings: Dict[str, List[int]] = defaultdict(list)
+        pairs: List[Tuple[str, int]] = []
+        for user_id, *doc in rows:
+            data.docs[user_id] = tuple(doc)
+            keys = _keys(doc)
+            pairs.extend((key, user_id) for key in keys)
+            for gram in _trigrams(keys):
+                postings[gram].append(user_id)
+        pairs.sort()
+        data.keys = [key for key, _ in pairs]
+        data.key_ids = array("I", (user_id for _, user_id in pairs))
+        data.postings = {gram: array("I", ids) for gram, ids in postings.items()}
+        return data
+
+    def add(self, user_id: int, doc: Doc) -> None:
+        self.docs[user_id] = doc
+        keys = _keys(doc)
+        for key in keys:
+            pos = bisect_left(self.keys, key)
+            while pos < len(self.keys) and self.keys[pos] == key and self.key_ids[pos] < user_id:
+                pos += 1
+            self.keys.insert(pos, key)
+            self.key_ids.insert(pos, user_id)
+        for gram in _trigrams(keys):
+            ids = self.postings.get(gram)
+            if ids is None:
+                self.postings[gram] = array("I", [user_id])
+            else:
+                insort(ids, user_id)
+
+    def remove(self, user_id: int) -> None:
+        doc = self.docs.pop(user_id, None)
+        if doc is None:
+            return
+        keys = _keys(doc)
+        for key in keys:
+            pos = bisect_left(self.keys, key)
+            while pos < len(self.keys) and self.keys[pos] == key:
+                if self.key_ids[pos] == user_id:
+                    del self.keys[pos]
+                    del self.key_ids[pos]
+                    break
+                pos += 1
+        for gram in _trigrams(keys):
+            ids = self.postings[gram]
+            pos = bisect_left(ids, user_id)
+            if pos < len(ids) and ids[pos] == user_id:
+                del ids[pos]
+            if not ids:
+                del self.postings[gram]
+
+    def prefix_matches(self, term: str) -> Iterator[int]:
+        """
+        Ids whose fields start with `term`, exact matches first, then in
+        key order. Each user may be yielded once per matching field.
+        """
+        pos = bisect_left(self.keys, term)
+        while pos < len(self.keys) and self.keys[pos].startswith(term):
+            yield self.key_ids[pos]
+            pos += 1
+
+    def substring_candidates(self, term: str, max_scan: int) -> Iterator[Optional[int]]:
+        """
+        Ids present in every trigram posting of `term`, walking the shortest
+        list and probing the others. Stops after `max_scan` ids of the
+        shortest list, which bounds the cost of very common terms, and then
+        yields a final None to tell the caller the scan was incomplete.
+        """
+        lists = [self.postings.get(term[i:i + 3]) for i in range(len(term) - 2)]
+        if not all(lists):
+            return
+        lists.sort(key=len)
+        smallest, others = lists[0], lists[1:]
+        for scanned, user_id in enumerate(smallest):
+            if scanned >= max_scan:
+                yield None
+                return
+            for ids in others:
+                pos = bisect_left(ids, user_id)
+                if pos == len(ids) or ids[pos] != user_id:
+                    break
+            else:
+                yield user_id
+
+
+class UserSearchIndex:
+    """
+    In-process typeahead index over email, username and full name.
+
+    Terms shorter than MIN_SUBSTRING_LENGTH match field prefixes; longer
+    terms also match substrings. Results rank exact matches, then prefix
+    matches, then substring matches. Every query stops after `limit`
+    results or USER_SEARCH_MAX_SCAN substring candidates, so its cost does
+    not grow with the table; a query that hits the cap is answered by SQL.
+
+    The index is built at startup off the event loop and updated by
+    UserService writes. Writes that bypass UserService (the bulk import
+    command, ad-hoc SQL) are only picked up by a rebuild: call `rebuild()`
+    (POST /users/search/rebuild) or set USER_SEARCH_REFRESH_SECONDS.
+    """
+
+    def __init__(self, enabled: bool, refresh_seconds: int = 0, max_scan: int = 2000):
+        self.enabled = enabled
+        self.refresh_seconds = refresh_seconds
+        self.max_scan = max_scan
+        self.ready = False
+        self.data = IndexData()
+        # Live writes seen while a build is in progress, replayed after the swap
+        self._pending: Optional[Dict[int, Optional[Doc]]] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._rebuild_task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def rebuild(self) -> bool:
+        if not self.enabled:
+            return False
+        if self._rebuild_task is None or self._rebuild_task.done():
+            self._rebuild_task = asyncio.get_running_loop().create_task(self._build())
+        return True
+
+    async def stop(self) -> None:
+        for task in (self._task, self._rebuild_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._rebuild_task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self._build()
+            if not self.refresh_seconds:
+                return
+            await asyncio.sleep(self.refresh_seconds)
+
+    async def _build(self) -> None:
+        async with self._lock:
+            self._pending = {}
+            try:
+                rows = await self._fetch_rows()
+                data = await asyncio.get_running_loop().run_in_executor(None, IndexData.build, rows)
+            except asyncio.CancelledError:
+                self._pending = None
+                raise
+            except Exception:
+                self._pending = None
+                logger.error("Building the user search index failed", exc_info=True)
+                return
+            self.load(data)
+            logger.info(f"User search index ready with {len(data.docs)} users")
+
+    async def _fetch_rows(self) -> List[Tuple]:
+        columns = (User.id, User.email, User.username, User.full_name, User.role, User.is_active)
+        rows: List[Tuple] = []
+        async with SessionLocal() as db:
+            result = await db.stream(
+                select(*columns).order_by(User.id).execution_options(yield_per=settings.USER_SEARCH_BUILD_BATCH)
+            )
+            async for partition in result.partitions():
+                rows.extend(tuple(row) for row in partition)
+        return rows
+
+    def load(self, data: IndexData) -> None:
+        """
+        Swap in freshly built data, replaying writes made during the build.
+        """
+        for user_id, doc in (self._pending or {}).items():
+            data.remove(user_id)
+            if doc is not None:
+                data.add(user_id, doc)
+        self._pending = None
+        self.data = data
+        self.ready = True
+
+    def _record(self, user_id: int, doc: Optional[Doc]) -> None:
+        if self._pending is not None:
+            self._pending[user_id] = doc
+        self.data.remove(user_id)
+        if doc is not None:
+            self.data.add(user_id, doc)
+
+    def upsert(self, user: User) -> None:
+        if self.enabled:
+            self._record(user.id, (user.email, user.username, user.full_name, user.role, user.is_active))
+
+    def remove(self, user_id: int) -> None:
+        if self.enabled:
+            self._record(user_id, None)
+
+    def search(self, term: str, limit: int = 20) -> Optional[List[Dict[str, Any]]]:
+        """
+        Up to `limit` ranked matches, or None when the candidate scan cap was
+        reached before `limit` matches were confirmed. The index cannot
+        answer that query completely, so the caller should ask SQL instead.
+        """
+        term = term.strip().lower()
+        if not term:
+            return []
+        data = self.data
+        found: Dict[int, None] = {}
+        for user_id in data.prefix_matches(term):
+            found.setdefault(user_id)
+            if len(found) >= limit:
+                break
+        if len(found) < limit and len(term) >= MIN_SUBSTRING_LENGTH:
+            for user_id in data.substring_candidates(term, self.max_scan):
+                if user_id is None:
+                    return None
+                if user_id in found:
+                    continue
+                # Trigrams can match across fields or out of order; confirm
+                if any(field and term in field.lower() for field in data.docs[user_id][:3]):
+                    found[user_id] = None
+                    if len(found) >= limit:
+                        break
+        return [
+            {
+                "id": user_id,
+                "email": data.docs[user_id][0],
+                "full_name": data.docs[user_id][2],
+                "role": data.docs[user_id][3],
+                "is_active": data.docs[user_id][4],
+            }
+            for user_id in found
+        ]
+
+
+user_search_index = UserSearchIndex(
+    enabled=settings.USER_SEARCH_INDEX_ENABLED,
+    refresh_seconds=settings.USER_SEARCH_REFRESH_SECONDS,
+    max_scan=settings.USER_SEARCH_MAX_SCAN,
+)
@@ -1,10 +1,12 @@
 from datetime import datetime
-from typing import Optional, Tuple
+from typing import Optional, Tuple, List, Dict, Any
 from fastapi import HTTPException, status
 from app.db.user_repository import UserRepository
 from app.schemas.user import UserCreate, UserLogin
 from app.core.security import get_password_hash, verify_password, create_access_token, create_refresh_token
 from app.models.user import User
+from app.services.user_events import user_events
+from app.services.user_search import user_search_index, MIN_SUBSTRING_LENGTH
 
 class UserService:
     def __init__(self, user_repo: UserRepository):
@@ -24,7 +26,10 @@ class UserService:
         password = user_data.pop("password")
         user_data["hashed_password"] = get_password_hash(password)
         
-        return await self.user_repo.create(user_data)
+        user = await self.user_repo.create(user_data)
+        user_events.publish("created", user)
+        user_search_index.upsert(user)
+        return user
 
     async def authenticate(self, login_data: UserLogin) -> Tuple[str, str]:
         user = await self.user_repo.get_by_email(login_data.email)
@@ -46,9 +51,46 @@ class UserService:
     async def get_user_by_id(self, user_id: int) -> Optional[User]:
         return await self.user_repo.get(user_id)
 
+    async def get_user_fields(self, user_id: int, fields: List[str]) -> Dict[str, Any]:
+        user = await self.user_repo.get_fields(user_id, fields)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found",
+            )
+        return user
+
+    async def get_users_by_keys(self, values: List[Any], key: str = "id") -> Dict[Any, User]:
+        """
+        Batch lookup by id or email. Returns found users keyed by id, or by
+        lower-cased email.
+        """
+        if not values:
+            return {}
+        users = await self.user_repo.get_many(values, key=key)
+        if key == "email":
+            return {user.email.lower(): user for user in users}
+        return {getattr(user, key): user for user in users}
+
     async def get_users(self, skip: int = 0, limit: int = 100) -> list[User]:
         return await self.user_repo.get_multi(skip=skip, limit=limit)
 
+    async def get_users_fields(self, fields: List[str], skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        return await self.user_repo.get_multi_fields(fields, skip=skip, limit=limit)
+
+    async def search_users(self, term: str, limit: int = 20) -> List[Any]:
+        """
+        Typeahead search, served from the in-memory index once it is built
+        and SQL otherwise, or when the index cannot answer a query fully.
+        Short terms match field prefixes only, on both paths.
+        """
+        if user_search_index.ready:
+            results = user_search_index.search(term, limit=limit)
+            if results is not None:
+                return results
+        term = term.strip()
+        return await self.user_repo.search(term, limit=limit, prefix_only=len(term) < MIN_SUBSTRING_LENGTH)
+
     async def update_user(self, user_id: int, user_update: dict) -> User:
         user = await self.get_user_by_id(user_id)
         if not user:
@@ -60,7 +102,10 @@ class UserService:
         if "password" in user_update and user_update["password"]:
             user_update["hashed_password"] = get_password_hash(user_update.pop("password"))
         
-        return await self.user_repo.update(user, user_update)
+        user = await self.user_repo.update(user, user_update)
+        user_events.publish("updated", user)
+        user_search_index.upsert(user)
+        return user
 
     async def delete_user(self, user_id: int) -> User:
         user = await self.get_user_by_id(user_id)
@@ -69,4 +114,7 @@ class UserService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found",
             )
-        return await self.user_repo.remove(user_id)
+        user = await self.user_repo.remove(user_id)
+        user_events.publish("deleted", user)
+        user_search_index.remove(user_id)
+        return user
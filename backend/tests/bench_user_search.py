@@ -0,0 +1,44 @@
+"""
+Latency benchmark for the in-memory user search index. Not collected by
+pytest; run it from backend/ with:
+
+    python -m tests.bench_user_search [users]
+"""
+import statistics
+import sys
+import time
+from app.services.user_search import IndexData, UserSearchIndex
+from tests.test_user_search import make_rows, sample_terms
+
+TERMS = ["com", "a", "jo", "smith", "example.com", "@e", "khan12", "zzq", "@gmail.org"]
+
+
+def timed(index, term, repeat=20):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = index.search(term, limit=20)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000, result
+
+
+def main() -> None:
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rows = make_rows(size)
+    started = time.perf_counter()
+    index = UserSearchIndex(enabled=True)
+    index.load(IndexData.build(rows))
+    print(f"Built index of {size} users in {time.perf_counter() - started:.1f}s")
+
+    for term in TERMS:
+        median_ms, result = timed(index, term)
+        outcome = "SQL fallback" if result is None else f"{len(result)} results"
+        print(f"{term!r:>14}: {median_ms:.3f} ms median, {outcome}")
+
+    terms = sample_terms(rows, 1000)
+    fallbacks = sum(index.search(term, limit=20) is None for term in terms)
+    print(f"{fallbacks} of {len(terms)} sampled terms fell back to SQL (max_scan={index.max_scan})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import random
+import pytest
+from app.models.user import UserRole
+from app.services.user_search import IndexData, UserSearchIndex, MIN_SUBSTRING_LENGTH
+
+INDEX_SIZE = 2_000
+FIRST_NAMES = ["John", "Jane", "Joseph", "Alice", "Amir", "Sara", "Omar", "Li", "Maria", "Ahmed"]
+LAST_NAMES = ["Smith", "Johnson", "Khan", "Garcia", "Brown", "Ali", "Nguyen", "Smithers", "Jones", "Lee"]
+DOMAINS = ["example.com", "gmail.com", "corp.io", "mail.org"]
+
+
+def make_rows(count):
+    rng = random.Random(0)
+    rows = []
+    for user_id in range(1, count + 1):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        email = f"{first.lower()}.{last.lower()}{user_id}@{rng.choice(DOMAINS)}"
+        rows.append((user_id, email, email, f"{first} {last}", UserRole.USER, True))
+    return rows
+
+
+@pytest.fixture(scope="module")
+def rows():
+    return make_rows(INDEX_SIZE)
+
+
+@pytest.fixture(scope="module")
+def index(rows):
+    index = UserSearchIndex(enabled=True, max_scan=INDEX_SIZE)
+    index.load(IndexData.build(rows))
+    return index
+
+
+class FakeUser:
+    def __init__(self, id, email, full_name=None):
+        self.id = id
+        self.email = email
+        self.username = email
+        self.full_name = full_name
+        self.role = UserRole.USER
+        self.is_active = True
+
+
+def brute_force(rows, term):
+    """
+    Ids a complete search must consider matches: field prefixes for short
+    terms, substrings otherwise (the SQL fallback's semantics).
+    """
+    matches = set()
+    for user_id, *doc in rows:
+        fields = [field.lower() for field in doc[:3] if field]
+        if len(term) < MIN_SUBSTRING_LENGTH:
+            hit = any(field.startswith(term) for field in fields)
+        else:
+            hit = any(term in field for field in fields)
+        if hit:
+            matches.add(user_id)
+    return matches
+
+
+def sample_terms(rows, count):
+    rng = random.Random(1)
+    terms = []
+    for _ in range(count):
+        email = rng.choice(rows)[1]
+        size = rng.randint(1, 8)
+        start = rng.randint(0, len(email) - size)
+        terms.append(email[start:start + size])
+    return terms
+
+
+def assert_complete(result, expected, limit):
+    ids = {user["id"] for user in result}
+    assert len(result) == len(ids) == min(limit, len(expected))
+    assert ids <= expected
+
+
+def test_recall_matches_brute_force(rows, index):
+    for term in sample_terms(rows, 300):
+        expected = brute_force(rows, term.lower())
+        result = index.search(term, limit=20)
+        assert result is not None, term
+        assert_complete(result, expected, 20)
+        if len(expected) <= 20:
+            assert {user["id"] for user in result} == expected
+
+
+def test_scan_cap_defers_to_sql_instead_of_dropping_matches(rows):
+    index = UserSearchIndex(enabled=True, max_scan=5)
+    index.load(IndexData.build(rows))
+    deferred = 0
+    for term in sample_terms(rows, 300):
+        result = index.search(term, limit=20)
+        if result is None:
+            deferred += 1
+            continue
+        assert_complete(result, brute_force(rows, term.lower()), 20)
+    assert deferred
+
+
+def test_short_terms_match_field_prefixes_only(index):
+    assert index.search("@e") == []
+    results = index.search("jo", limit=50)
+    assert len(results) == 50
+    for user in results:
+        assert user["email"].startswith("jo") or user["full_name"].lower().startswith("jo")
+
+
+def test_longer_terms_match_substrings(index):
+    results = index.search("smithers", limit=20)
+    assert len(results) == 20
+    assert all("smithers" in user["email"] for user in results)
+
+
+def test_exact_match_ranks_first():
+    index = UserSearchIndex(enabled=True)
+    index.load(IndexData.build([
+        (1, "ann.lee@corp.io", "ann.lee@corp.io", "Ann Lee", UserRole.USER, True),
+        (2, "ann@corp.io", "ann@corp.io", "Ann", UserRole.USER, True),
+        (3, "joanne@corp.io", "joanne@corp.io", "Joanne", UserRole.USER, True),
+    ]))
+    assert [user["id"] for user in index.search("ann")] == [2, 1, 3]
+
+
+def test_writes_update_index():
+    index = UserSearchIndex(enabled=True)
+    index.load(IndexData.build([]))
+    index.upsert(FakeUser(5, "first@corp.io", "First"))
+    assert [user["id"] for user in index.search("first")] == [5]
+
+    index.upsert(FakeUser(5, "second@corp.io", "Second"))
+    assert index.search("first") == []
+    assert [user["id"] for user in index.search("sec")] == [5]
+
+    index.remove(5)
+    assert index.search("sec") == []
+    assert index.data.keys == [] and index.data.postings == {}
+
+
+def test_writes_during_build_survive_swap():
+    index = UserSearchIndex(enabled=True)
+    stale_rows = [(1, "old@corp.io", "old@corp.io", "Old", UserRole.USER, True)]
+    index._pending = {}
+    index.upsert(FakeUser(1, "new@corp.io", "New"))
+    index.upsert(FakeUser(2, "added@corp.io"))
+    index.load(IndexData.build(stale_rows))
+    assert index.search("old") == []
+    assert [user["id"] for user in index.search("new")] == [1]
+    assert [user["id"] for user in index.search("added")] == [2]
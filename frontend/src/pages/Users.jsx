@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import UserModal from '../components/UserModal';
 import { userService } from '../services/userService';
 import { useAuth } from '../auth/AuthContext';
@@ -29,8 +29,36 @@ const Users = () => {
         }
     };
 
+    // Subscribe first and load the list once the stream is open, so no
+    // change can fall between the initial fetch and the subscription.
+    // Live changes are then applied instead of re-fetching the whole list.
+    const initialLoadDone = useRef(false);
     useEffect(() => {
-        fetchUsers();
+        const loadOnce = () => {
+            if (initialLoadDone.current) return;
+            initialLoadDone.current = true;
+            fetchUsers();
+        };
+        const unsubscribe = userService.subscribeToEvents((event) => {
+            if (event.type === 'hello') {
+                loadOnce();
+                return;
+            }
+            if (event.type === 'resync') {
+                fetchUsers();
+                return;
+            }
+            setUsers((prev) => {
+                const others = prev.filter((u) => u.id !== event.user.id);
+                if (event.type === 'deleted') return others;
+                if (event.type === 'created' && others.length === prev.length) return [...prev, event.user];
+                return prev.map((u) => (u.id === event.user.id ? event.user : u));
+            });
+        }, () => {
+            showToast('Live user updates are unavailable', 'error');
+            loadOnce();
+        });
+        return unsubscribe;
     }, []);
 
     const handleCreate = () => {
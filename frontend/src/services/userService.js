@@ -24,5 +24,62 @@ export const userService = {
     async deleteUser(id) {
         const response = await api.delete(`/users/${id}`);
         return response.data;
+    },
+
+    // Live user changes over Server-Sent Events. fetch is used instead of
+    // EventSource so the bearer token can be sent. Every stream opens with a
+    // `hello` event carrying the current sequence, so reconnects always
+    // resume (or get a resync). Auth failures stop retrying and go to
+    // onError. Returns an unsubscribe function.
+    subscribeToEvents(onEvent, onError) {
+        const controller = new AbortController();
+        let lastSeq = null;
+
+        const connect = async () => {
+            while (!controller.signal.aborted) {
+                try {
+                    const token = localStorage.getItem('access_token');
+                    const query = lastSeq !== null ? `?since=${lastSeq}` : '';
+                    const response = await fetch(`${api.defaults.baseURL}/users/events${query}`, {
+                        headers: { Authorization: `Bearer ${token}` },
+                        signal: controller.signal,
+                    });
+                    if (response.status === 401 || response.status === 403) {
+                        if (onError) onError(new Error(`Event stream refused: ${response.status}`));
+                        return;
+                    }
+                    if (!response.ok) throw new Error(`Event stream failed: ${response.status}`);
+
+                    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+                    let buffer = '';
+                    while (true) {
+                        const { value, done } = await reader.read();
+                        if (done) break;
+                        buffer += value;
+                        let boundary;
+                        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                            const message = buffer.slice(0, boundary);
+                            buffer = buffer.slice(boundary + 2);
+                            const data = message
+                                .split('\n')
+                                .filter((line) => line.startsWith('data: '))
+                                .map((line) => line.slice(6))
+                                .join('\n');
+                            if (data) {
+                                const event = JSON.parse(data);
+                                lastSeq = event.seq;
+                                onEvent(event);
+                            }
+                        }
+                    }
+                } catch (err) {
+                    if (controller.signal.aborted) return;
+                }
+                await new Promise((resolve) => setTimeout(resolve, 3000));
+            }
+        };
+
+        connect();
+        return () => controller.abort();
     }
 };